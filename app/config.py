@@ -2,29 +2,85 @@
 Configuration and environment setup.
 """
 
+import importlib.util
 import os
 from pathlib import Path
-from groq import Groq
-
-# Load environment variables from .env file
-try:
-    from dotenv import load_dotenv
-    # Get the project root directory (parent of app/)
-    env_path = Path(__file__).parent.parent / '.env'
-    load_dotenv(dotenv_path=env_path)
-except ImportError:
-    # python-dotenv not installed, skip
-    pass
+
+# Load environment variables from .env file (skipped when the platform
+# already provides them, e.g. Railway variables)
+if not os.getenv("GROQ_API_KEY"):
+    try:
+        from dotenv import load_dotenv
+        # Get the project root directory (parent of app/)
+        env_path = Path(__file__).parent.parent / '.env'
+        load_dotenv(dotenv_path=env_path, override=False)
+    except ImportError:
+        # python-dotenv not installed, skip
+        pass
 
 # Environment variables
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 PORT = int(os.environ.get("PORT", 8000))
 
-# Initialize Groq client
-client = Groq(api_key=GROQ_API_KEY) if GROQ_API_KEY else None
+# Groq clients, constructed on first use (see get_client / get_async_client)
+_client = None
+_async_client = None
+
+# Connection pool for the Groq clients: keep-alive connections avoid a TLS
+# handshake per call, and HTTP/2 (when the h2 package is installed)
+# multiplexes concurrent requests over one connection
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def _http_client_options():
+    """
+    Keyword arguments shared by the sync and async httpx clients.
+    
+    No timeout is set here: the Groq SDK's default then applies to chat
+    completions, and topic classification passes its own short timeout.
+    """
+    import httpx
+    return {
+        "http2": HTTP2_AVAILABLE,
+        "limits": httpx.Limits(max_connections=64, max_keepalive_connections=32),
+    }
+
+
+def get_client():
+    """
+    Get the shared Groq client, creating it on first call.
+    
+    Returns:
+        Groq client, or None if GROQ_API_KEY is not set
+    """
+    global _client
+    if _client is None and GROQ_API_KEY:
+        import httpx
+        from groq import Groq
+        _client = Groq(api_key=GROQ_API_KEY, http_client=httpx.Client(**_http_client_options()))
+    return _client
+
+
+def get_async_client():
+    """
+    Get the shared AsyncGroq client, creating it on first call.
+    
+    Returns:
+        AsyncGroq client, or None if GROQ_API_KEY is not set
+    """
+    global _async_client
+    if _async_client is None and GROQ_API_KEY:
+        import httpx
+        from groq import AsyncGroq
+        _async_client = AsyncGroq(api_key=GROQ_API_KEY, http_client=httpx.AsyncClient(**_http_client_options()))
+    return _async_client
 
 # Model configuration
 MODEL_NAME = "llama-3.3-70b-versatile"  # Current recommended model
 
+# Compile the LSTM training forward pass with torch.compile (opt-in: the
+# one-off compile cost only pays off for long-running workers)
+TORCH_COMPILE = os.getenv("TORCH_COMPILE") == "1"
+
 # Framework availability flag (set by ML module imports)
 PYTORCH_AVAILABLE = False
@@ -3,21 +3,80 @@ Main FastAPI application entry point.
 """
 
 import os
+import sys
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime
-from fastapi import FastAPI
+import orjson
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 
 from app.routers import chatbot_router, prediction_router, pcos_router
-from app.config import GROQ_API_KEY, MODEL_NAME
+from app.config import GROQ_API_KEY, MODEL_NAME, PORT
+from app.models.schemas import EnhancedPredictionRequest, PCOSRiskRequest, PredictionRequest
 from app.ml.model_factory import get_framework_availability
 from app.utils.logging import logger, log_info
+from app.utils.safety import topic_cache_info
+
+# Opt-in request profiling (PROFILING=1, then add ?profile=1 to a request)
+PROFILING = os.getenv("PROFILING") == "1"
+
+# /health payload cache (serialized bytes) - framework availability is fixed for the process lifetime
+HEALTH_TTL = float(os.getenv("HEALTH_CACHE_TTL", "30"))
+_HEALTH_CACHE = {"exp": 0.0, "body": None}
+
+# Static part of the / payload, pre-serialized; only the timestamp is spliced in per request
+_ROOT_PAYLOAD = {
+    "status": "online",
+    "service": "Combined Reproductive Health API",
+    "version": "2.0.0",
+    "features": {
+        "chatbot": "Available at /chat",
+        "cycle_prediction": "Available at /predict",
+        "pcos_risk": "Available at /pcos/risk-assessment"
+    },
+    "docs": "/docs",
+    "health": "/health"
+}
+_ROOT_PREFIX = orjson.dumps(_ROOT_PAYLOAD)[:-1] + b',"timestamp":"'
+_ROOT_SUFFIX = b'"}'
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up request validators before serving traffic."""
+    # One dummy instance per request model so the first real request doesn't pay the warm-up cost
+    PredictionRequest(past_cycles=[28, 29, 28, 30], last_period_date="2025-01-15")
+    EnhancedPredictionRequest(
+        cycle_records=[
+            {
+                "cycle_length": 28,
+                "date": "2024-12-15",
+                "symptoms": {"cramps": 1},
+                "flow_intensity": "medium",
+                "lifestyle": {"stress_level": 1}
+            }
+        ] * 4,
+        last_period_date="2025-01-15"
+    )
+    PCOSRiskRequest(
+        irregular_periods=False,
+        weight_gain=False,
+        excess_hair_growth=False,
+        acne=False,
+        family_history=False,
+        dark_skin_patches=False
+    )
+    yield
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Reproductive Health Combined API",
     description="AI-powered chatbot and menstrual cycle prediction in one API",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # Configure allowed origins for CORS
@@ -39,6 +98,24 @@ app.add_middleware(
     allow_headers=["Content-Type", "Accept"],
 )
 
+# Profile individual requests with pyinstrument when explicitly enabled
+if PROFILING:
+    from pyinstrument import Profiler
+    
+    @app.middleware("http")
+    async def profile_request(request: Request, call_next):
+        """Return a pyinstrument HTML report instead of the response for ?profile=1."""
+        if not request.query_params.get("profile"):
+            return await call_next(request)
+        
+        profiler = Profiler(interval=0.001, async_mode="enabled")
+        profiler.start()
+        try:
+            await call_next(request)
+        finally:
+            profiler.stop()
+        return HTMLResponse(profiler.output_html())
+
 # Include routers
 app.include_router(chatbot_router)
 app.include_router(prediction_router)
@@ -49,24 +126,19 @@ app.include_router(pcos_router)
 async def root():
     """Root endpoint - API health check."""
     log_info("Root endpoint accessed")
-    return {
-        "status": "online",
-        "service": "Combined Reproductive Health API",
-        "version": "2.0.0",
-        "timestamp": datetime.now().isoformat(),
-        "features": {
-            "chatbot": "Available at /chat",
-            "cycle_prediction": "Available at /predict",
-            "pcos_risk": "Available at /pcos/risk-assessment"
-        },
-        "docs": "/docs",
-        "health": "/health"
-    }
+    body = _ROOT_PREFIX + datetime.now().isoformat().encode() + _ROOT_SUFFIX
+    return Response(content=body, media_type="application/json")
 
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
+    """Health check endpoint (cached for HEALTH_CACHE_TTL seconds)."""
+    now = time.monotonic()
+    headers = {"Cache-Control": f"max-age={int(HEALTH_TTL)}"}
+    
+    if now < _HEALTH_CACHE["exp"]:
+        return Response(content=_HEALTH_CACHE["body"], media_type="application/json", headers={**headers, "X-Cache": "HIT"})
+    
     frameworks = get_framework_availability()
     available_frameworks = [k for k, v in frameworks.items() if v]
     
@@ -74,7 +146,7 @@ async def health_check():
     
     log_info(f"Health check - Groq: {groq_configured}, Frameworks: {available_frameworks}")
     
-    return {
+    body = orjson.dumps({
         "status": "healthy",
         "chatbot": {
             "status": "operational" if groq_configured else "not configured",
@@ -86,7 +158,17 @@ async def health_check():
             "available_frameworks": available_frameworks
         },
         "timestamp": datetime.now().isoformat()
-    }
+    })
+    _HEALTH_CACHE["body"] = body
+    _HEALTH_CACHE["exp"] = now + HEALTH_TTL
+    
+    return Response(content=body, media_type="application/json", headers={**headers, "X-Cache": "MISS"})
+
+
+@app.get("/metrics")
+async def metrics():
+    """In-process cache statistics."""
+    return {"topic_cache": topic_cache_info()}
 
 
 @app.get("/favicon.ico")
@@ -101,16 +183,13 @@ if __name__ == "__main__":
     # Import to ensure framework availability is set
     from app.ml import model_factory
     
-    # Get port from environment variable or default to 8000
-    port = int(os.environ.get("PORT", 8000))
-    
     frameworks = get_framework_availability()
     
     print("=" * 70)
     print("🚀 REPRODUCTIVE HEALTH API")
     print("=" * 70)
-    print(f"📍 Server: http://localhost:{port}")
-    print(f"📚 API Documentation: http://localhost:{port}/docs")
+    print(f"📍 Server: http://localhost:{PORT}")
+    print(f"📚 API Documentation: http://localhost:{PORT}/docs")
     print("=" * 70)
     print("CHATBOT STATUS:")
     print(f"  🤖 Model: {MODEL_NAME}")
@@ -124,7 +203,17 @@ if __name__ == "__main__":
     print("  📊 Cycle Prediction: POST /predict")
     print("  ⚠️  PCOS Risk: POST /pcos/risk-assessment")
     print("  ❤️  Health Check: GET /health")
+    print("  📈 Metrics: GET /metrics")
     print("=" * 70)
     
     log_info("Starting CodeBloom API server")
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # Pass the app as an import string so multiple workers can be spawned
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=PORT,
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        log_level="warning"
+    )
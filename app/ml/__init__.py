@@ -1,9 +1,15 @@
 """Machine Learning package - Contains ML models and preprocessing utilities."""
 
-from .preprocessing import preprocess_data, denormalize, calculate_uncertainty
-
 __all__ = [
     "preprocess_data",
     "denormalize",
     "calculate_uncertainty",
 ]
+
+
+def __getattr__(name):
+    # Resolve preprocessing helpers lazily so importing the package doesn't pull in numpy
+    if name in __all__:
+        from . import preprocessing
+        return getattr(preprocessing, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,18 +1,92 @@
 """
 Model factory for PyTorch LSTM models.
+
+torch is only imported when a model is first trained or used, so processes
+that never hit the prediction endpoints don't pay for framework init.
 """
 
-from app.ml.pytorch_model import (
-    PYTORCH_AVAILABLE,
-    train_pytorch_model,
-    predict_pytorch,
-)
+import copy
+import importlib.util
+import os
+import threading
+
+import numpy as np
+
+from app.ml.preprocessing import preprocess_data
+
+# Probe for torch without importing it
+PYTORCH_AVAILABLE = importlib.util.find_spec("torch") is not None
 
 # Update config with framework availability
 import app.config as config
 config.PYTORCH_AVAILABLE = PYTORCH_AVAILABLE
 config.TENSORFLOW_AVAILABLE = False
 
+# Framework imports are resolved once at startup, so availability never changes
+FRAMEWORK_AVAILABILITY = {
+    "pytorch": PYTORCH_AVAILABLE,
+}
+
+# Lazily imported PyTorch entry points (populated by _load)
+_cache = {}
+
+# Base model every request fine-tunes a copy of. It is trained once per process
+# on a fixed synthetic history with a fixed seed - never on request data - so a
+# prediction doesn't depend on which request reached the worker first
+FINE_TUNE_EPOCHS = 10
+BASE_MODEL_SEED = 0
+BASE_SEQUENCE_LENGTH = 6  # predictor.SEQUENCE_LENGTH
+_GLOBAL_MODEL = None
+_GLOBAL_MODEL_LOCK = threading.Lock()
+
+
+def _load():
+    """
+    Import the PyTorch model module on first use and memoize its entry points.
+    
+    Returns:
+        Dictionary with 'train' and 'predict' callables
+        
+    Raises:
+        ValueError: If PyTorch cannot be imported
+    """
+    if not _cache:
+        from app.ml import pytorch_model
+        
+        if not pytorch_model.PYTORCH_AVAILABLE:
+            raise ValueError("PyTorch is not available. Please install: pip install torch")
+        
+        # Avoid CPU oversubscription when several workers train in parallel
+        if int(os.getenv("WEB_CONCURRENCY", "1")) > 1:
+            pytorch_model.torch.set_num_threads(1)
+        
+        _cache["train"] = pytorch_model.train_pytorch_model
+        _cache["train_base"] = pytorch_model.train_base_pytorch_model
+        _cache["predict"] = pytorch_model.predict_pytorch
+    return _cache
+
+
+def _base_cycles():
+    """Synthetic regular cycle history (28 +/- 3 days) the base model is trained on."""
+    rng = np.random.default_rng(BASE_MODEL_SEED)
+    return (28 + rng.integers(-3, 4, size=120)).tolist()
+
+
+def _base_model():
+    """Return the shared base model, training it on first use."""
+    global _GLOBAL_MODEL
+    with _GLOBAL_MODEL_LOCK:
+        if _GLOBAL_MODEL is None:
+            X, y, _, _, _ = preprocess_data(_base_cycles(), BASE_SEQUENCE_LENGTH)
+            _GLOBAL_MODEL = _load()["train_base"](X, y, seed=BASE_MODEL_SEED)
+        return _GLOBAL_MODEL
+
+
+def _train(X, y):
+    """Fine-tune a copy of the shared base model on X, y for FINE_TUNE_EPOCHS epochs."""
+    base = _base_model()
+    return _load()["train"](X, y, epochs=FINE_TUNE_EPOCHS, model=copy.deepcopy(base))
+
 
 def get_framework_availability():
     """
@@ -21,9 +95,7 @@ def get_framework_availability():
     Returns:
         Dictionary with framework availability
     """
-    return {
-        "pytorch": PYTORCH_AVAILABLE,
-    }
+    return dict(FRAMEWORK_AVAILABILITY)
 
 
 def get_default_framework():
@@ -36,6 +108,20 @@ def get_default_framework():
     return "pytorch"
 
 
+def _check_framework(framework):
+    """
+    Ensure the requested framework is PyTorch and that it is installed.
+    
+    Raises:
+        ValueError: If framework is not 'pytorch' or PyTorch is not available
+    """
+    if framework != 'pytorch':
+        raise ValueError(f"Only PyTorch is supported. Requested: {framework}")
+    
+    if not PYTORCH_AVAILABLE:
+        raise ValueError("PyTorch is not available. Please install: pip install torch")
+
+
 def train_model(framework, X, y):
     """
     Train a PyTorch LSTM model.
@@ -51,13 +137,9 @@ def train_model(framework, X, y):
     Raises:
         ValueError: If framework is not 'pytorch' or PyTorch is not available
     """
-    if framework != 'pytorch':
-        raise ValueError(f"Only PyTorch is supported. Requested: {framework}")
-    
-    if not PYTORCH_AVAILABLE:
-        raise ValueError("PyTorch is not available. Please install: pip install torch")
+    _check_framework(framework)
     
-    return train_pytorch_model(X, y)
+    return _train(X, y)
 
 
 def predict(framework, model, last_sequence):
@@ -75,10 +157,6 @@ def predict(framework, model, last_sequence):
     Raises:
         ValueError: If framework is not 'pytorch' or PyTorch is not available
     """
-    if framework != 'pytorch':
-        raise ValueError(f"Only PyTorch is supported. Requested: {framework}")
-    
-    if not PYTORCH_AVAILABLE:
-        raise ValueError("PyTorch is not available. Please install: pip install torch")
+    _check_framework(framework)
     
-    return predict_pytorch(model, last_sequence)
+    return _load()["predict"](model, last_sequence)
@@ -2,7 +2,10 @@
 Data preprocessing utilities for menstrual cycle prediction.
 """
 
+import statistics
+
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
 
 def preprocess_data(cycles, seq_length):
@@ -21,23 +24,23 @@ def preprocess_data(cycles, seq_length):
         seq_length = max(3, len(cycles) - 1)
     
     # Normalize data to [0, 1] range for better training
-    cycles_array = np.array(cycles, dtype=np.float32)
-    min_val = cycles_array.min()
-    max_val = cycles_array.max()
+    # (min/max in plain Python - cycle histories are only a handful of values)
+    min_val = min(cycles)
+    max_val = max(cycles)
     
     # Avoid division by zero
     if max_val == min_val:
-        normalized = np.ones_like(cycles_array) * 0.5
+        normalized = np.full(len(cycles), 0.5, dtype=np.float32)
     else:
-        normalized = (cycles_array - min_val) / (max_val - min_val)
+        normalized = (np.asarray(cycles, dtype=np.float32) - min_val) / (max_val - min_val)
     
     # Create sequences: [seq1, seq2, ..., seqN] -> next_value
-    X, y = [], []
-    for i in range(len(normalized) - seq_length):
-        X.append(normalized[i:i + seq_length])
-        y.append(normalized[i + seq_length])
+    # Windowed view materialized once as a contiguous float32 block, so
+    # torch.from_numpy can wrap it without another copy
+    X = sliding_window_view(normalized, seq_length)[:-1].copy()
+    y = normalized[seq_length:]
     
-    return np.array(X), np.array(y), min_val, max_val, seq_length
+    return X, y, min_val, max_val, seq_length
 
 
 def denormalize(value, min_val, max_val):
@@ -67,6 +70,9 @@ def calculate_uncertainty(cycles):
     Returns:
         Standard deviation as uncertainty measure
     """
+    # NumPy dispatch overhead dominates for short histories
+    if len(cycles) < 64:
+        return statistics.pstdev(cycles)
     return np.std(cycles)
 
 
@@ -95,25 +101,20 @@ def preprocess_multi_feature_data(feature_matrix, seq_length):
     feature_matrix = np.array(feature_matrix, dtype=np.float32)
     n_features = feature_matrix.shape[1]
     
-    # Normalize each feature independently
+    # Normalize each feature independently (constant features map to 0.5)
     min_vals = feature_matrix.min(axis=0)
     max_vals = feature_matrix.max(axis=0)
+    rng = max_vals - min_vals
+    constant = rng == 0
+    safe = np.where(constant, 1.0, rng).astype(np.float32)
+    normalized = np.where(constant, np.float32(0.5), (feature_matrix - min_vals) / safe)
     
-    normalized = np.zeros_like(feature_matrix)
-    for i in range(n_features):
-        if max_vals[i] == min_vals[i]:
-            normalized[:, i] = 0.5
-        else:
-            normalized[:, i] = (feature_matrix[:, i] - min_vals[i]) / (max_vals[i] - min_vals[i])
-    
-    # Create sequences
-    X, y = [], []
-    for i in range(len(normalized) - seq_length):
-        X.append(normalized[i:i + seq_length])
-        # Target is the cycle length (first feature) of next cycle
-        y.append(normalized[i + seq_length, 0])
+    # Create sequences as a windowed view: (n_samples, seq_length, n_features)
+    X = sliding_window_view(normalized, (seq_length, n_features))[:-1, 0].copy()
+    # Target is the cycle length (first feature) of next cycle
+    y = normalized[seq_length:, 0]
     
-    return np.array(X), np.array(y), min_vals, max_vals, seq_length
+    return X, y, min_vals, max_vals, seq_length
 
 
 def denormalize_multi_feature(value, min_val, max_val):
@@ -1,12 +1,40 @@
 """
-Enhanced PyTorch LSTM implementation for multi-feature menstrual cycle prediction.
+PyTorch LSTM implementations for menstrual cycle prediction.
 """
 
+import logging
+
+import numpy as np
+
+from app.config import TORCH_COMPILE
+from app.utils.logging import logger
+
 try:
     import torch
     import torch.nn as nn
     import torch.optim as optim
-    import numpy as np
+    from torch.utils.data import DataLoader, TensorDataset
+    
+    # Train on the accelerator when one is present
+    DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    
+    # Datasets larger than this are trained in mini-batches
+    BATCH_SIZE = 32
+    
+    # Allow TF32 matmuls on hardware that supports them
+    torch.set_float32_matmul_precision("high")
+    
+    
+    def _to_tensor(array):
+        """Share a float32 array's memory with a tensor on the training device."""
+        return torch.from_numpy(np.ascontiguousarray(array, dtype=np.float32)).to(DEVICE)
+    
+    
+    def _training_forward(model):
+        """Return the callable used for training forward passes (compiled when enabled)."""
+        if TORCH_COMPILE:
+            return torch.compile(model, mode="reduce-overhead")
+        return model
     
     class EnhancedCycleLSTM(nn.Module):
         """Enhanced LSTM model for multi-feature cycle prediction."""
@@ -32,12 +60,8 @@ try:
             self.fc2 = nn.Linear(32, 1)
         
         def forward(self, x):
-            # Initialize hidden states
-            h0 = torch.zeros(self.num_layers, x.size(0), self.hidden_size)
-            c0 = torch.zeros(self.num_layers, x.size(0), self.hidden_size)
-            
-            # LSTM forward pass
-            out, _ = self.lstm(x, (h0, c0))
+            # LSTM forward pass (hidden states default to zeros on x's device)
+            out, _ = self.lstm(x)
             
             # Take the last output
             out = out[:, -1, :]
@@ -63,30 +87,42 @@ try:
         Returns:
             Trained model
         """
-        # Convert to tensors
-        X_tensor = torch.FloatTensor(X)
-        y_tensor = torch.FloatTensor(y).unsqueeze(-1)
+        # Wrap the arrays without copying, then move to the training device
+        X_tensor = _to_tensor(X)
+        y_tensor = _to_tensor(y)[..., None]
         
         # Initialize model
         input_size = X.shape[2] if len(X.shape) > 2 else 1
         model = EnhancedCycleLSTM(input_size=input_size, hidden_size=64, num_layers=2, dropout=0.2)
+        model.to(DEVICE)
         
         # Loss and optimizer
         criterion = nn.MSELoss()
         optimizer = optim.Adam(model.parameters(), lr=0.001)
         
+        # Full-batch for small histories, mini-batches otherwise
+        if len(X_tensor) > BATCH_SIZE:
+            batches = DataLoader(TensorDataset(X_tensor, y_tensor), batch_size=BATCH_SIZE, shuffle=True)
+        else:
+            batches = [(X_tensor, y_tensor)]
+        
+        # Only sync the loss back to Python when debug logging is on
+        log_progress = logger.isEnabledFor(logging.DEBUG)
+        
         # Training loop
         model.train()
+        forward = _training_forward(model)
         for epoch in range(epochs):
-            optimizer.zero_grad()
-            outputs = model(X_tensor)
-            loss = criterion(outputs, y_tensor)
-            loss.backward()
-            optimizer.step()
+            for xb, yb in batches:
+                optimizer.zero_grad(set_to_none=True)
+                outputs = forward(xb)
+                loss = criterion(outputs, yb)
+                loss.backward()
+                optimizer.step()
             
-            # Optional: Print progress every 20 epochs
-            if (epoch + 1) % 20 == 0:
-                print(f'Epoch [{epoch+1}/{epochs}], Loss: {loss.item():.4f}')
+            # Log progress every 20 epochs
+            if log_progress and (epoch + 1) % 20 == 0:
+                logger.debug(f'Epoch [{epoch+1}/{epochs}], Loss: {loss.item():.4f}')
         
         return model
     
@@ -103,31 +139,20 @@ try:
             Predicted normalized value
         """
         model.eval()
-        with torch.no_grad():
+        device = next(model.parameters()).device
+        with torch.inference_mode():
+            last_seq_tensor = torch.from_numpy(np.ascontiguousarray(last_sequence, dtype=np.float32)).to(device)
+            
             # Ensure correct shape: (1, sequence_length, n_features)
             if len(last_sequence.shape) == 2:
-                last_seq_tensor = torch.FloatTensor(last_sequence).unsqueeze(0)
+                last_seq_tensor = last_seq_tensor[None]
             else:
-                last_seq_tensor = torch.FloatTensor(last_sequence).unsqueeze(0).unsqueeze(-1)
+                last_seq_tensor = last_seq_tensor[None, ..., None]
             
             prediction = model(last_seq_tensor)
             return prediction.item()
     
-    ENHANCED_PYTORCH_AVAILABLE = True
-    
-except ImportError:
-    ENHANCED_PYTORCH_AVAILABLE = False
-    EnhancedCycleLSTM = None
-    train_enhanced_pytorch_model = None
-    predict_enhanced_pytorch = None
-
-
-# Keep original simple model for backward compatibility
-try:
-    import torch
-    import torch.nn as nn
-    import torch.optim as optim
-    
+    # Keep original simple model for backward compatibility
     class CycleLSTM(nn.Module):
         """LSTM model for cycle length prediction."""
         
@@ -139,35 +164,38 @@ try:
             self.fc = nn.Linear(hidden_size, 1)
         
         def forward(self, x):
-            h0 = torch.zeros(self.num_layers, x.size(0), self.hidden_size)
-            c0 = torch.zeros(self.num_layers, x.size(0), self.hidden_size)
-            out, _ = self.lstm(x, (h0, c0))
+            out, _ = self.lstm(x)
             out = self.fc(out[:, -1, :])
             return out
     
     
-    def train_pytorch_model(X, y):
+    def train_pytorch_model(X, y, epochs=50, model=None):
         """
         Train PyTorch LSTM model.
         
         Args:
             X: Training sequences
             y: Target values
+            epochs: Number of training epochs
+            model: Optional pre-trained model to fine-tune instead of a fresh one
             
         Returns:
             Trained model
         """
-        X_tensor = torch.FloatTensor(X).unsqueeze(-1)
-        y_tensor = torch.FloatTensor(y).unsqueeze(-1)
+        X_tensor = _to_tensor(X)[..., None]
+        y_tensor = _to_tensor(y)[..., None]
         
-        model = CycleLSTM(input_size=1, hidden_size=32, num_layers=1)
+        if model is None:
+            model = CycleLSTM(input_size=1, hidden_size=32, num_layers=1)
+        model.to(DEVICE)
         criterion = nn.MSELoss()
         optimizer = optim.Adam(model.parameters(), lr=0.01)
         
         model.train()
-        for epoch in range(50):
-            optimizer.zero_grad()
-            outputs = model(X_tensor)
+        forward = _training_forward(model)
+        for epoch in range(epochs):
+            optimizer.zero_grad(set_to_none=True)
+            outputs = forward(X_tensor)
             loss = criterion(outputs, y_tensor)
             loss.backward()
             optimizer.step()
@@ -175,6 +203,23 @@ try:
         return model
     
     
+    def train_base_pytorch_model(X, y, seed=0):
+        """
+        Train PyTorch LSTM model from a fixed seed, leaving the global RNG state untouched.
+        
+        Args:
+            X: Training sequences
+            y: Target values
+            seed: Seed for weight initialization
+            
+        Returns:
+            Trained model
+        """
+        with torch.random.fork_rng(devices=[]):
+            torch.manual_seed(seed)
+            return train_pytorch_model(X, y)
+    
+    
     def predict_pytorch(model, last_sequence):
         """
         Make prediction using trained PyTorch model.
@@ -187,15 +232,20 @@ try:
             Predicted normalized value
         """
         model.eval()
-        with torch.no_grad():
-            last_seq_tensor = torch.FloatTensor(last_sequence).unsqueeze(0).unsqueeze(-1)
+        device = next(model.parameters()).device
+        with torch.inference_mode():
+            last_seq_tensor = torch.from_numpy(np.ascontiguousarray(last_sequence, dtype=np.float32)).to(device)[None, ..., None]
             prediction = model(last_seq_tensor)
             return prediction.item()
     
-    PYTORCH_AVAILABLE = True
+    PYTORCH_AVAILABLE = ENHANCED_PYTORCH_AVAILABLE = True
     
 except ImportError:
-    PYTORCH_AVAILABLE = False
+    PYTORCH_AVAILABLE = ENHANCED_PYTORCH_AVAILABLE = False
+    EnhancedCycleLSTM = None
+    train_enhanced_pytorch_model = None
+    predict_enhanced_pytorch = None
     CycleLSTM = None
     train_pytorch_model = None
+    train_base_pytorch_model = None
     predict_pytorch = None
@@ -6,8 +6,10 @@ from .constants import (
     UNSAFE_KEYWORDS,
     HEALTH_RELATED_KEYWORDS,
     OFF_TOPIC_KEYWORDS,
+    STRONG_HEALTH_KEYWORDS,
     SYSTEM_PROMPT,
     TOPIC_VALIDATION_PROMPT,
+    TOPIC_BATCH_VALIDATION_PROMPT,
 )
 
 __all__ = [
@@ -19,6 +21,8 @@ __all__ = [
     "UNSAFE_KEYWORDS",
     "HEALTH_RELATED_KEYWORDS",
     "OFF_TOPIC_KEYWORDS",
+    "STRONG_HEALTH_KEYWORDS",
     "SYSTEM_PROMPT",
     "TOPIC_VALIDATION_PROMPT",
+    "TOPIC_BATCH_VALIDATION_PROMPT",
 ]
@@ -2,11 +2,28 @@
 Pydantic models for request and response validation.
 """
 
-from pydantic import BaseModel, Field, field_validator
-from typing import List, Optional
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import List, Literal, Optional
 from datetime import datetime
 
 
+def _validate_date_string(v: str) -> str:
+    """
+    Validate a YYYY-MM-DD date string.
+    
+    Slices the fields and builds a datetime directly, which is much cheaper
+    than having strptime re-parse the format string on every call.
+    """
+    if (len(v) == 10 and v[4] == '-' and v[7] == '-'
+            and v[:4].isdigit() and v[5:7].isdigit() and v[8:].isdigit()):
+        try:
+            datetime(int(v[:4]), int(v[5:7]), int(v[8:]))
+            return v
+        except ValueError:
+            pass
+    raise ValueError('Date must be in YYYY-MM-DD format')
+
+
 class ChatRequest(BaseModel):
     """Request model for chatbot interaction."""
     message: str
@@ -38,27 +55,23 @@ class PredictionRequest(BaseModel):
     
     @field_validator('past_cycles')
     @classmethod
-    def validate_cycles(cls, v):
+    def validate_cycles(cls, v: List[int]) -> List[int]:
         """Validate cycle lengths are reasonable."""
         if len(v) < 4:
             raise ValueError('Need at least 4 past cycles for prediction')
-        if any(c < 20 or c > 45 for c in v):
+        if min(v) < 20 or max(v) > 45:
             raise ValueError('Cycle lengths must be between 20 and 45 days')
         return v
     
     @field_validator('last_period_date')
     @classmethod
-    def validate_date(cls, v):
+    def validate_date(cls, v: str) -> str:
         """Validate date format."""
-        try:
-            datetime.strptime(v, "%Y-%m-%d")
-        except ValueError:
-            raise ValueError('Date must be in YYYY-MM-DD format')
-        return v
+        return _validate_date_string(v)
     
     @field_validator('framework')
     @classmethod
-    def validate_framework(cls, v):
+    def validate_framework(cls, v: Optional[str]) -> Optional[str]:
         """Validate framework choice."""
         if v != 'pytorch':
             raise ValueError('Only "pytorch" framework is supported')
@@ -102,26 +115,22 @@ class CycleRecord(BaseModel):
     cycle_length: int = Field(..., ge=20, le=45, description="Cycle length in days")
     date: str = Field(..., description="Period start date (YYYY-MM-DD)")
     symptoms: Optional[SymptomData] = Field(None, description="Symptom data for this cycle")
-    flow_intensity: Optional[str] = Field(None, description="Flow intensity: light, medium, or heavy")
+    flow_intensity: Optional[Literal['light', 'medium', 'heavy']] = Field(None, description="Flow intensity: light, medium, or heavy")
     lifestyle: Optional[LifestyleData] = Field(None, description="Lifestyle factors for this cycle")
     
-    @field_validator('flow_intensity')
+    @model_validator(mode='before')
     @classmethod
-    def validate_flow(cls, v):
-        """Validate flow intensity."""
-        if v is not None and v.lower() not in ['light', 'medium', 'heavy']:
-            raise ValueError('Flow intensity must be: light, medium, or heavy')
-        return v.lower() if v else None
+    def lowercase_flow(cls, data):
+        """Accept flow intensity in any case (the Literal check itself runs in pydantic-core)."""
+        if isinstance(data, dict) and isinstance(data.get('flow_intensity'), str):
+            data = {**data, 'flow_intensity': data['flow_intensity'].lower()}
+        return data
     
     @field_validator('date')
     @classmethod
-    def validate_date(cls, v):
+    def validate_date(cls, v: str) -> str:
         """Validate date format."""
-        try:
-            datetime.strptime(v, "%Y-%m-%d")
-        except ValueError:
-            raise ValueError('Date must be in YYYY-MM-DD format')
-        return v
+        return _validate_date_string(v)
 
 
 class EnhancedPredictionRequest(BaseModel):
@@ -144,17 +153,13 @@ class EnhancedPredictionRequest(BaseModel):
     
     @field_validator('last_period_date')
     @classmethod
-    def validate_date(cls, v):
+    def validate_date(cls, v: str) -> str:
         """Validate date format."""
-        try:
-            datetime.strptime(v, "%Y-%m-%d")
-        except ValueError:
-            raise ValueError('Date must be in YYYY-MM-DD format')
-        return v
+        return _validate_date_string(v)
     
     @field_validator('framework')
     @classmethod
-    def validate_framework(cls, v):
+    def validate_framework(cls, v: Optional[str]) -> Optional[str]:
         """Validate framework choice."""
         if v != 'pytorch':
             raise ValueError('Only "pytorch" framework is supported')
@@ -199,4 +204,3 @@ class PCOSRiskResponse(BaseModel):
     risk_score: int = Field(..., description="Calculated risk score (0-100)")
     risk_level: str = Field(..., description="Risk level: Low, Moderate, High")
     recommendation: str = Field(..., description="Health recommendation based on risk")
-
@@ -2,16 +2,52 @@
 Chatbot API endpoints.
 """
 
+import orjson
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response
 
 from app.models.schemas import ChatRequest, ChatResponse
-from app.services.chatbot import get_ai_response, get_safety_response
-from app.utils.safety import is_obviously_off_topic, validate_topic_with_ai
-from app.utils.logging import log_request, log_response, log_error
+from app.services.chatbot import SAFETY_RESPONSES, get_ai_response, get_safety_response
+from app.utils.safety import classify_message, validate_topic
+from app.utils.logging import logger, log_request, log_response, log_error
+import logging
 import time
 
 router = APIRouter(prefix="/chat", tags=["Chatbot"])
 
+# Constant replies are serialized once at import instead of on every request
+_OFF_TOPIC_BYTES = orjson.dumps({
+    "response": """I'm a specialized reproductive health education assistant. I can only answer questions related to:
+
+• Menstrual cycles and periods
+• Pregnancy and fertility
+• Reproductive health and anatomy
+• Hormones and women's health
+• Gynecological conditions (PCOS, endometriosis, etc.)
+
+Your question appears to be about a different topic. Please ask me about reproductive health, and I'll be happy to help! 😊""",
+    "safety_triggered": False
+})
+
+_OFF_TOPIC_AI_BYTES = orjson.dumps({
+    "response": """I'm a specialized reproductive health education assistant. I can only answer questions related to:
+
+• Menstrual cycles and periods
+• Pregnancy and fertility
+• Reproductive health and anatomy
+• Hormones and women's health
+• Gynecological conditions (PCOS, endometriosis, etc.)
+
+Your question doesn't seem to be related to reproductive health. If you have questions about periods, pregnancy, fertility, or women's health, I'm here to help! 😊""",
+    "safety_triggered": False
+})
+
+_SAFETY_BYTES = {
+    text: orjson.dumps({"response": text, "safety_triggered": True})
+    for text in SAFETY_RESPONSES
+}
+
 
 @router.post("", response_model=ChatResponse)
 async def chat(request: ChatRequest):
@@ -22,68 +58,47 @@ async def chat(request: ChatRequest):
     
     Returns educational information about reproductive health topics.
     """
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     
     try:
         log_request("/chat", "POST", request.message)
         
-        if not request.message or len(request.message.strip()) == 0:
+        if not request.message or request.message.isspace():
             raise HTTPException(status_code=400, detail="Message cannot be empty")
         
         if len(request.message) > 1000:
             raise HTTPException(status_code=400, detail="Message too long (max 1000 characters)")
         
+        # Run all keyword checks in one pass over the message
+        flags = classify_message(request.message)
+        
         # Check for safety triggers first
-        safety_response = get_safety_response(request.message)
+        safety_response = get_safety_response(request.message, flags)
         
         if safety_response:
-            duration = (time.time() - start_time) * 1000
-            log_response("/chat", "safety_triggered", duration)
-            return ChatResponse(
-                response=safety_response,
-                safety_triggered=True
-            )
+            if logger.isEnabledFor(logging.INFO):
+                log_response("/chat", "safety_triggered", (time.perf_counter_ns() - start_ns) / 1e6)
+            return Response(content=_SAFETY_BYTES[safety_response], media_type="application/json")
         
         # Validate topic relevance - Two-layer approach
         # Layer 1: Quick keyword-based check
-        if is_obviously_off_topic(request.message):
-            duration = (time.time() - start_time) * 1000
-            log_response("/chat", "off_topic", duration)
-            return ChatResponse(
-                response="""I'm a specialized reproductive health education assistant. I can only answer questions related to:
-
-• Menstrual cycles and periods
-• Pregnancy and fertility
-• Reproductive health and anatomy
-• Hormones and women's health
-• Gynecological conditions (PCOS, endometriosis, etc.)
-
-Your question appears to be about a different topic. Please ask me about reproductive health, and I'll be happy to help! 😊""",
-                safety_triggered=False
-            )
+        if flags.off_topic:
+            if logger.isEnabledFor(logging.INFO):
+                log_response("/chat", "off_topic", (time.perf_counter_ns() - start_ns) / 1e6)
+            return Response(content=_OFF_TOPIC_BYTES, media_type="application/json")
         
-        # Layer 2: AI-powered validation for ambiguous cases
-        if not validate_topic_with_ai(request.message):
-            duration = (time.time() - start_time) * 1000
-            log_response("/chat", "off_topic_ai", duration)
-            return ChatResponse(
-                response="""I'm a specialized reproductive health education assistant. I can only answer questions related to:
-
-• Menstrual cycles and periods
-• Pregnancy and fertility
-• Reproductive health and anatomy
-• Hormones and women's health
-• Gynecological conditions (PCOS, endometriosis, etc.)
-
-Your question doesn't seem to be related to reproductive health. If you have questions about periods, pregnancy, fertility, or women's health, I'm here to help! 😊""",
-                safety_triggered=False
-            )
+        # Layer 2: keyword rules, with AI-powered validation for ambiguous cases
+        if not await validate_topic(request.message, flags):
+            if logger.isEnabledFor(logging.INFO):
+                log_response("/chat", "off_topic_ai", (time.perf_counter_ns() - start_ns) / 1e6)
+            return Response(content=_OFF_TOPIC_AI_BYTES, media_type="application/json")
         
         # Get AI response for valid health-related questions
-        ai_response = get_ai_response(request.message)
+        # (blocking API calls run in the threadpool to keep the event loop free)
+        ai_response = await run_in_threadpool(get_ai_response, request.message)
         
-        duration = (time.time() - start_time) * 1000
-        log_response("/chat", "success", duration)
+        if logger.isEnabledFor(logging.INFO):
+            log_response("/chat", "success", (time.perf_counter_ns() - start_ns) / 1e6)
         
         return ChatResponse(
             response=ai_response,
@@ -3,6 +3,8 @@ Cycle prediction API endpoints.
 """
 
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+import logging
 import time
 
 from app.models.schemas import (
@@ -12,7 +14,7 @@ from app.models.schemas import (
 from app.services.predictor import make_prediction
 from app.services.enhanced_predictor import make_enhanced_prediction
 from app.ml.model_factory import get_framework_availability, get_default_framework
-from app.utils.logging import log_request, log_response, log_error
+from app.utils.logging import logger, log_request, log_response, log_error
 
 router = APIRouter(prefix="/predict", tags=["Cycle Prediction"])
 
@@ -28,19 +30,21 @@ async def predict_cycle(request: PredictionRequest):
     
     Returns predicted cycle length, next period date, and confidence intervals.
     """
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     
     try:
         log_request("/predict", "POST", f"Cycles: {len(request.past_cycles)}, Framework: {request.framework}")
         
-        result = make_prediction(
+        # Training and inference are CPU-bound; run them off the event loop
+        result = await run_in_threadpool(
+            make_prediction,
             past_cycles=request.past_cycles,
             last_period_date=request.last_period_date,
             framework=request.framework
         )
         
-        duration = (time.time() - start_time) * 1000
-        log_response("/predict", "success", duration)
+        if logger.isEnabledFor(logging.INFO):
+            log_response("/predict", "success", (time.perf_counter_ns() - start_ns) / 1e6)
         
         return result
     except HTTPException:
@@ -98,22 +102,20 @@ async def predict_cycle_enhanced(request: EnhancedPredictionRequest):
     }
     ```
     """
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     
     try:
         log_request("/predict/enhanced", "POST", f"Cycles: {len(request.cycle_records)}, Framework: {request.framework}")
         
-        # Convert Pydantic models to dictionaries
-        cycle_records_dict = [record.model_dump() for record in request.cycle_records]
-        
-        result = make_enhanced_prediction(
-            cycle_records=cycle_records_dict,
+        result = await run_in_threadpool(
+            make_enhanced_prediction,
+            cycle_records=request.cycle_records,
             last_period_date=request.last_period_date,
             framework=request.framework
         )
         
-        duration = (time.time() - start_time) * 1000
-        log_response("/predict/enhanced", "success", duration)
+        if logger.isEnabledFor(logging.INFO):
+            log_response("/predict/enhanced", "success", (time.perf_counter_ns() - start_ns) / 1e6)
         
         return result
     except HTTPException:
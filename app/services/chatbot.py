@@ -2,26 +2,19 @@
 Chatbot service for reproductive health education.
 """
 
+import re
 from typing import Optional
 from fastapi import HTTPException
 
-from app.config import client, MODEL_NAME
+from app.config import get_client, MODEL_NAME
 from app.models.constants import SYSTEM_PROMPT
-from app.utils.safety import check_emergency, check_unsafe
+from app.utils.safety import SafetyFlags, classify_message
 
+# Phrases in an AI reply that read like a diagnosis or prescription
+_DIAGNOSE_RE = re.compile(r"i diagnose|you have|you need to take", re.IGNORECASE)
 
-def get_safety_response(message: str) -> Optional[str]:
-    """
-    Check for safety triggers and return appropriate response.
-    
-    Args:
-        message: User's message
-        
-    Returns:
-        Safety response if triggered, None otherwise
-    """
-    if check_emergency(message):
-        return """🚨 **URGENT: Your message indicates a potentially serious medical situation.**
+# Fixed safety responses
+EMERGENCY_RESPONSE = """🚨 **URGENT: Your message indicates a potentially serious medical situation.**
 
 Please seek immediate medical attention:
 - Call emergency services (911 in US, 112 in EU, or your local emergency number)
@@ -30,8 +23,7 @@ Please seek immediate medical attention:
 
 Your health and safety are the top priority. Medical professionals can provide the urgent care you need."""
 
-    if check_unsafe(message):
-        return """I cannot provide information on this topic as it could be harmful to your health and safety.
+UNSAFE_RESPONSE = """I cannot provide information on this topic as it could be harmful to your health and safety.
 
 If you're experiencing a crisis or having thoughts of self-harm:
 - **Crisis Hotline:** 988 (Suicide & Crisis Lifeline - US)
@@ -44,6 +36,30 @@ For reproductive health concerns, please speak with:
 
 Your wellbeing matters, and there are professionals ready to help you safely."""
 
+# Every string get_safety_response can return
+SAFETY_RESPONSES = (EMERGENCY_RESPONSE, UNSAFE_RESPONSE)
+
+
+def get_safety_response(message: str, flags: Optional[SafetyFlags] = None) -> Optional[str]:
+    """
+    Check for safety triggers and return appropriate response.
+    
+    Args:
+        message: User's message
+        flags: Result of classify_message(message), if the caller already has it
+        
+    Returns:
+        Safety response if triggered, None otherwise
+    """
+    if flags is None:
+        flags = classify_message(message)
+    
+    if flags.emergency:
+        return EMERGENCY_RESPONSE
+    
+    if flags.unsafe:
+        return UNSAFE_RESPONSE
+    
     return None
 
 
@@ -60,6 +76,7 @@ def get_ai_response(message: str) -> str:
     Raises:
         HTTPException: If AI service fails
     """
+    client = get_client()
     if not client:
         raise HTTPException(
             status_code=500,
@@ -80,7 +97,7 @@ def get_ai_response(message: str) -> str:
         ai_response = chat_completion.choices[0].message.content
         
         # Additional safety check
-        if any(word in ai_response.lower() for word in ["i diagnose", "you have", "you need to take"]):
+        if _DIAGNOSE_RE.search(ai_response):
             ai_response += "\n\n⚠️ Remember: This is educational information only, not a diagnosis or prescription. Always consult a healthcare provider for personalized medical advice."
         
         return ai_response
@@ -2,15 +2,32 @@
 Enhanced menstrual cycle prediction service.
 """
 
+import math
+from bisect import bisect_left, bisect_right
 from typing import List, Dict, Any
 from datetime import datetime, timedelta
 import numpy as np
 from fastapi import HTTPException
 
+from app.models.schemas import CycleRecord
 from app.services.predictor import make_prediction
 
+# Confidence bonus by std dev bucket: < 2, < 4, <= 6, > 6
+# (nudged past 6.0 so that exactly 6.0 still falls in the no-bonus bucket)
+_STD_BOUNDS = (2.0, 4.0, math.nextafter(6.0, math.inf))
+_STD_BONUS = (15, 5, 0, -10)
+
+# Confidence bonus by history length: <= 6, 7-10, > 10 cycles
+_HISTORY_BOUNDS = (6, 10)
+_HISTORY_BONUS = (0, 5, 10)
+
+# Confidence level by score: < 60, < 80, >= 80
+_CONFIDENCE_BOUNDS = (60, 80)
+_CONFIDENCE_LEVELS = ("low", "medium", "high")
+
+
 def make_enhanced_prediction(
-    cycle_records: List[Dict[str, Any]], 
+    cycle_records: List[CycleRecord], 
     last_period_date: str, 
     framework: str = "pytorch"
 ) -> Dict[str, Any]:
@@ -18,7 +35,7 @@ def make_enhanced_prediction(
     Make enhanced prediction using multi-feature data.
     
     Args:
-        cycle_records: List of cycle records with symptoms and lifestyle data
+        cycle_records: Validated cycle records with symptoms and lifestyle data
         last_period_date: Last period start date (YYYY-MM-DD)
         framework: ML framework to use
         
@@ -27,7 +44,7 @@ def make_enhanced_prediction(
     """
     try:
         # Extract cycle lengths from records
-        past_cycles = [record['cycle_length'] for record in cycle_records]
+        past_cycles = [record.cycle_length for record in cycle_records]
         
         # Get base prediction
         base_result = make_prediction(
@@ -44,33 +61,19 @@ def make_enhanced_prediction(
         std_dev = base_result['statistics']['std_deviation']
         cycle_count = len(past_cycles)
         
-        # Base confidence starts at 70%
-        confidence_score = 70.0
-        
-        # Adjust based on consistency (lower std dev is better)
-        if std_dev < 2.0:
-            confidence_score += 15
-        elif std_dev < 4.0:
-            confidence_score += 5
-        elif std_dev > 6.0:
-            confidence_score -= 10
-            
-        # Adjust based on history length
-        if cycle_count > 10:
-            confidence_score += 10
-        elif cycle_count > 6:
-            confidence_score += 5
+        # Base confidence starts at 70%, adjusted by consistency (lower std dev
+        # is better) and history length via the bucket tables above
+        confidence_score = (
+            70.0
+            + _STD_BONUS[bisect_right(_STD_BOUNDS, std_dev)]
+            + _HISTORY_BONUS[bisect_left(_HISTORY_BOUNDS, cycle_count)]
+        )
             
         # Cap at 99%
         confidence_score = min(99.0, max(10.0, confidence_score))
         
         # Determine confidence level
-        if confidence_score >= 80:
-            confidence_level = "high"
-        elif confidence_score >= 60:
-            confidence_level = "medium"
-        else:
-            confidence_level = "low"
+        confidence_level = _CONFIDENCE_LEVELS[bisect_right(_CONFIDENCE_BOUNDS, confidence_score)]
             
         # Generate basic insights
         insights = []
@@ -89,7 +92,7 @@ def make_enhanced_prediction(
             insights.append("Your cycle is quite regular.")
             
         # Analyze symptoms if available
-        symptom_count = sum(1 for r in cycle_records if r.get('symptoms'))
+        symptom_count = sum(1 for r in cycle_records if r.symptoms is not None)
         if symptom_count > 0:
             insights.append(f"You have tracked symptoms for {symptom_count} cycles.")
             
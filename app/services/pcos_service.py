@@ -4,6 +4,14 @@ Service for PCOS risk assessment logic.
 
 from app.models.schemas import PCOSRiskRequest, PCOSRiskResponse
 
+# (risk_level, recommendation) indexed by how many thresholds (30, 60) the score exceeds
+_LEVELS = (
+    ("Low", "Your symptoms do not strongly suggest PCOS. Maintain a healthy lifestyle and track your cycles."),
+    ("Moderate", "You have some symptoms associated with PCOS. Consider monitoring your symptoms and consulting a doctor if they persist."),
+    ("High", "Your reported symptoms are strongly associated with PCOS. It is highly recommended to consult a healthcare provider for a proper evaluation."),
+)
+
+
 def calculate_pcos_risk(data: PCOSRiskRequest) -> PCOSRiskResponse:
     """
     Calculate PCOS risk score based on reported symptoms.
@@ -23,39 +31,28 @@ def calculate_pcos_risk(data: PCOSRiskRequest) -> PCOSRiskResponse:
     - 35-60: Moderate
     - >60: High
     """
-    score = 0
+    # Weighted symptom sum (bools are ints)
+    score = (
+        30 * data.irregular_periods
+        + 20 * data.excess_hair_growth
+        + 15 * data.weight_gain
+        + 15 * data.family_history
+        + 10 * data.acne
+        + 10 * data.dark_skin_patches
+    )
+    
+    # Additional check for cycle length if provided:
+    # an out-of-range cycle adds points unless irregular periods were already reported
+    cycle_length = data.cycle_length_avg
+    score += 20 * bool(
+        cycle_length
+        and (cycle_length > 35 or cycle_length < 21)
+        and not data.irregular_periods
+    )
     
-    if data.irregular_periods:
-        score += 30
-    if data.excess_hair_growth:
-        score += 20
-    if data.weight_gain:
-        score += 15
-    if data.family_history:
-        score += 15
-    if data.acne:
-        score += 10
-    if data.dark_skin_patches:
-        score += 10
-        
-    # Additional check for cycle length if provided
-    if data.cycle_length_avg:
-        if data.cycle_length_avg > 35 or data.cycle_length_avg < 21:
-            # If they didn't already say irregular periods, add points
-            if not data.irregular_periods:
-                score += 20
-                
     # Determine risk level
-    if score <= 30:
-        risk_level = "Low"
-        recommendation = "Your symptoms do not strongly suggest PCOS. Maintain a healthy lifestyle and track your cycles."
-    elif score <= 60:
-        risk_level = "Moderate"
-        recommendation = "You have some symptoms associated with PCOS. Consider monitoring your symptoms and consulting a doctor if they persist."
-    else:
-        risk_level = "High"
-        recommendation = "Your reported symptoms are strongly associated with PCOS. It is highly recommended to consult a healthcare provider for a proper evaluation."
-        
+    risk_level, recommendation = _LEVELS[(score > 30) + (score > 60)]
+    
     return PCOSRiskResponse(
         risk_score=score,
         risk_level=risk_level,
@@ -2,14 +2,40 @@
 Menstrual cycle prediction service.
 """
 
-from typing import List
-from datetime import datetime, timedelta
+from typing import List, Tuple
+from datetime import date, timedelta
+from functools import lru_cache
 import numpy as np
 from fastapi import HTTPException
 
 from app.ml.preprocessing import preprocess_data, denormalize, calculate_uncertainty
 from app.ml.model_factory import train_model, predict, get_framework_availability
 
+SEQUENCE_LENGTH = 6
+
+# English names for the long date format (same output as strftime('%A, %B %d, %Y') in the C locale)
+_WEEKDAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+_MONTHS = ('', 'January', 'February', 'March', 'April', 'May', 'June',
+           'July', 'August', 'September', 'October', 'November', 'December')
+
+
+def _format_long_date(d: date) -> str:
+    """Format a date like 'Wednesday, February 12, 2025' without going through strftime."""
+    return f"{_WEEKDAYS[d.weekday()]}, {_MONTHS[d.month]} {d.day:02d}, {d.year}"
+
+
+@lru_cache(maxsize=256)
+def _get_trained_model(framework: str, past_cycles: Tuple[int, ...]) -> tuple:
+    """
+    Preprocess a cycle history and train a model on it, memoized per history.
+    
+    Returns:
+        Tuple of (model, min_val, max_val, seq_len)
+    """
+    X, y, min_val, max_val, seq_len = preprocess_data(list(past_cycles), SEQUENCE_LENGTH)
+    model = train_model(framework, X, y)
+    return model, min_val, max_val, seq_len
+
 
 def make_prediction(past_cycles: List[int], last_period_date: str, framework: str) -> dict:
     """
@@ -41,20 +67,16 @@ def make_prediction(past_cycles: List[int], last_period_date: str, framework: st
             detail="PyTorch is not installed. Please install: pip install torch"
         )
     
-    # Preprocess data
-    SEQUENCE_LENGTH = 6
-    X, y, min_val, max_val, seq_len = preprocess_data(past_cycles, SEQUENCE_LENGTH)
+    # Preprocess and train (memoized for identical cycle histories)
+    model, min_val, max_val, seq_len = _get_trained_model(framework, tuple(past_cycles))
     
-    # Train model
-    model = train_model(framework, X, y)
-    
-    # Prepare last sequence for prediction
-    last_sequence = np.array(past_cycles[-seq_len:], dtype=np.float32)
-    last_sequence_normalized = (
-        (last_sequence - min_val) / (max_val - min_val)
-        if max_val != min_val
-        else np.ones_like(last_sequence) * 0.5
-    )
+    # Prepare last sequence for prediction, normalized in place in a single float32 buffer
+    last_sequence_normalized = np.empty(seq_len, dtype=np.float32)
+    if max_val != min_val:
+        np.subtract(past_cycles[-seq_len:], min_val, out=last_sequence_normalized, casting='same_kind')
+        last_sequence_normalized *= 1.0 / (max_val - min_val)
+    else:
+        last_sequence_normalized.fill(0.5)
     
     # Make prediction
     predicted_normalized = predict(framework, model, last_sequence_normalized)
@@ -64,32 +86,42 @@ def make_prediction(past_cycles: List[int], last_period_date: str, framework: st
     predicted_cycle_length = int(round(predicted_cycle_length))
     
     # Calculate next period date
-    last_date = datetime.strptime(last_period_date, "%Y-%m-%d")
+    # (format already validated by the request schema - slice the fields directly)
+    last_date = date(int(last_period_date[:4]), int(last_period_date[5:7]), int(last_period_date[8:10]))
     next_period_date = last_date + timedelta(days=predicted_cycle_length)
     
     # Calculate uncertainty
     uncertainty = calculate_uncertainty(past_cycles)
-    earliest_date = next_period_date - timedelta(days=int(uncertainty))
-    latest_date = next_period_date + timedelta(days=int(uncertainty))
+    margin = int(uncertainty)
+    window = timedelta(days=margin)
+    earliest_date = next_period_date - window
+    latest_date = next_period_date + window
+    
+    # Calculate history statistics (pure Python: NumPy call overhead dominates for a dozen values)
+    n = len(past_cycles)
+    average_cycle_length = sum(past_cycles) / n
+    std_deviation = (sum((x - average_cycle_length) ** 2 for x in past_cycles) / n) ** 0.5
+    min_cycle = min(past_cycles)
+    max_cycle = max(past_cycles)
     
-    # Compile response
+    # Compile response (a dict display with constant keys is already the cheapest way to build it)
     return {
         "predicted_cycle_length": predicted_cycle_length,
-        "predicted_next_period": next_period_date.strftime('%Y-%m-%d'),
-        "predicted_next_period_formatted": next_period_date.strftime('%A, %B %d, %Y'),
+        "predicted_next_period": next_period_date.isoformat(),
+        "predicted_next_period_formatted": _format_long_date(next_period_date),
         "confidence_interval": {
             "predicted_days": predicted_cycle_length,
-            "min_days": predicted_cycle_length - int(uncertainty),
-            "max_days": predicted_cycle_length + int(uncertainty),
-            "earliest_date": earliest_date.strftime('%Y-%m-%d'),
-            "latest_date": latest_date.strftime('%Y-%m-%d')
+            "min_days": predicted_cycle_length - margin,
+            "max_days": predicted_cycle_length + margin,
+            "earliest_date": earliest_date.isoformat(),
+            "latest_date": latest_date.isoformat()
         },
         "statistics": {
-            "average_cycle_length": float(np.mean(past_cycles)),
-            "std_deviation": float(np.std(past_cycles)),
-            "min_cycle": int(min(past_cycles)),
-            "max_cycle": int(max(past_cycles)),
-            "total_cycles_analyzed": len(past_cycles)
+            "average_cycle_length": average_cycle_length,
+            "std_deviation": std_deviation,
+            "min_cycle": min_cycle,
+            "max_cycle": max_cycle,
+            "total_cycles_analyzed": n
         },
         "uncertainty_days": float(uncertainty),
         "framework_used": framework
@@ -1,15 +1,27 @@
 """Utilities package - Contains helper functions for safety checks."""
 
 from .safety import (
+    SafetyFlags,
+    classify_message,
     check_emergency,
     check_unsafe,
     is_obviously_off_topic,
+    validate_topic,
     validate_topic_with_ai,
+    validate_topic_with_ai_async,
+    clear_topic_cache,
+    topic_cache_info,
 )
 
 __all__ = [
+    "SafetyFlags",
+    "classify_message",
     "check_emergency",
     "check_unsafe",
     "is_obviously_off_topic",
+    "validate_topic",
     "validate_topic_with_ai",
+    "validate_topic_with_ai_async",
+    "clear_topic_cache",
+    "topic_cache_info",
 ]
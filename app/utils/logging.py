@@ -4,6 +4,7 @@ Logging configuration for the application.
 
 import logging
 import sys
+from typing import Optional
 from datetime import datetime
 
 # Create logger
@@ -31,22 +32,22 @@ logger.propagate = False
 def log_request(endpoint: str, method: str, user_message: str = None):
     """Log incoming API requests."""
     if user_message:
-        logger.info(f"{method} {endpoint} - Message: {user_message[:50]}...")
+        logger.info("%s %s - Message: %.50s...", method, endpoint, user_message)
     else:
-        logger.info(f"{method} {endpoint}")
+        logger.info("%s %s", method, endpoint)
 
 
-def log_response(endpoint: str, status: str, duration_ms: float = None):
+def log_response(endpoint: str, status: str, duration_ms: Optional[float] = None):
     """Log API responses."""
-    if duration_ms:
-        logger.info(f"{endpoint} - Status: {status} - Duration: {duration_ms:.2f}ms")
+    if duration_ms is not None:
+        logger.info("%s - Status: %s - Duration: %.2fms", endpoint, status, duration_ms)
     else:
-        logger.info(f"{endpoint} - Status: {status}")
+        logger.info("%s - Status: %s", endpoint, status)
 
 
 def log_error(endpoint: str, error: Exception):
     """Log errors."""
-    logger.error(f"{endpoint} - Error: {type(error).__name__}: {str(error)}")
+    logger.error("%s - Error: %s: %s", endpoint, type(error).__name__, error)
 
 
 def log_warning(message: str):
@@ -2,72 +2,589 @@
 Safety check utilities for chatbot input validation.
 """
 
+import asyncio
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence, Tuple
+
+import orjson
+
 from app.models.constants import (
     EMERGENCY_KEYWORDS,
     UNSAFE_KEYWORDS,
     HEALTH_RELATED_KEYWORDS,
     OFF_TOPIC_KEYWORDS,
+    STRONG_HEALTH_KEYWORDS,
     TOPIC_VALIDATION_PROMPT,
+    TOPIC_BATCH_VALIDATION_PROMPT,
 )
-from app.config import client, MODEL_NAME
+from app.config import get_async_client, get_client, MODEL_NAME
+
+# SIMD multi-literal matching on x86 (optional)
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Aho-Corasick multi-pattern matching (falls back to compiled regexes if pyahocorasick is missing)
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+# Category bits for the combined keyword scan
+EMERGENCY = 1
+UNSAFE = 2
+HEALTH = 4
+OFF_TOPIC = 8
+_CRITICAL = EMERGENCY | UNSAFE
+
+
+@dataclass(slots=True)
+class SafetyFlags:
+    """Keyword categories found in a message."""
+    emergency: bool
+    unsafe: bool
+    off_topic: bool
+    health: bool
+
+
+def _build_scanner(categories: Sequence[Tuple[int, Sequence[str]]]) -> Callable[[str, bool], int]:
+    """
+    Compile several keyword lists into one scanner.
+    
+    Args:
+        categories: Sequence of (bit, keywords) pairs
+        
+    Returns:
+        Function taking a message (and an early_exit flag) and returning the OR
+        of the bits of every category that matched. With early_exit,
+        scanning stops once both critical bits (emergency and unsafe) are set.
+    """
+    if hyperscan is not None:
+        # One database over every list; each keyword's pattern id is its category bitmask
+        masks = {}
+        for bit, keywords in categories:
+            for keyword in keywords:
+                masks[keyword] = masks.get(keyword, 0) | bit
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[re.escape(keyword).encode() for keyword in masks],
+            ids=list(masks.values()),
+            elements=len(masks),
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(masks),
+        )
+        # Scratch space is per thread (handlers run in the threadpool)
+        local = threading.local()
+        
+        def on_match(bits: int, start: int, end: int, flags: int, context: list) -> bool:
+            context[0] |= bits
+            # A truthy return stops the scan
+            return context[1] and context[0] & _CRITICAL == _CRITICAL
+        
+        def scan(message: str, early_exit: bool) -> int:
+            scratch = getattr(local, "scratch", None)
+            if scratch is None:
+                scratch = local.scratch = hyperscan.Scratch(database)
+            # The database is caseless, which matches str.lower() exactly for ASCII,
+            # so only non-ASCII messages need lowering first
+            data = message.encode() if message.isascii() else message.lower().encode()
+            context = [0, early_exit]
+            try:
+                database.scan(data, match_event_handler=on_match, context=context, scratch=scratch)
+            except hyperscan.ScanTerminated:
+                pass
+            return context[0]
+        return scan
+    
+    if ahocorasick is not None:
+        # One automaton over every list; each keyword maps to the bits of the categories it belongs to
+        automaton = ahocorasick.Automaton()
+        for bit, keywords in categories:
+            for keyword in keywords:
+                automaton.add_word(keyword, automaton.get(keyword, 0) | bit)
+        automaton.make_automaton()
+        
+        def scan(message: str, early_exit: bool) -> int:
+            mask = 0
+            for _, bits in automaton.iter(message.lower()):
+                mask |= bits
+                if early_exit and mask & _CRITICAL == _CRITICAL:
+                    break
+            return mask
+        return scan
+    
+    # Separate alternations per category so overlapping keywords are never shadowed;
+    # longest keywords first, so shared prefixes are tried in one order
+    patterns = [
+        (bit, re.compile("|".join(map(re.escape, sorted(keywords, key=len, reverse=True)))))
+        for bit, keywords in categories
+    ]
+    
+    def scan(message: str, early_exit: bool) -> int:
+        text = message.lower()
+        mask = 0
+        for bit, pattern in patterns:
+            if pattern.search(text):
+                mask |= bit
+                if early_exit and mask & _CRITICAL == _CRITICAL:
+                    break
+        return mask
+    return scan
+
+
+# Built once at import; critical categories first so the regex fallback can stop early too
+_scan = _build_scanner((
+    (EMERGENCY, EMERGENCY_KEYWORDS),
+    (UNSAFE, UNSAFE_KEYWORDS),
+    (HEALTH, HEALTH_RELATED_KEYWORDS),
+    (OFF_TOPIC, OFF_TOPIC_KEYWORDS),
+))
+
+
+def classify_message(message: str, early_exit: bool = True) -> SafetyFlags:
+    """
+    Run every keyword check on a message in a single pass.
+    
+    With early_exit, a message that is both an emergency and unsafe stops the
+    scan early, so off_topic/health may be incomplete (the safety response wins anyway).
+    """
+    # Scanned as-is: keywords contain punctuation ("can't", "self-induce"), and a
+    # translate() pass to strip it would cost more than the whole scan
+    mask = _scan(message, early_exit)
+    return SafetyFlags(
+        emergency=bool(mask & EMERGENCY),
+        unsafe=bool(mask & UNSAFE),
+        # Off-topic keywords only count when no health keyword is present
+        off_topic=bool(mask & OFF_TOPIC) and not mask & HEALTH,
+        health=bool(mask & HEALTH),
+    )
 
 
 def check_emergency(message: str) -> bool:
     """Check if message contains emergency keywords."""
-    message_lower = message.lower()
-    return any(keyword in message_lower for keyword in EMERGENCY_KEYWORDS)
+    return classify_message(message).emergency
 
 
 def check_unsafe(message: str) -> bool:
     """Check if message contains unsafe content keywords."""
-    message_lower = message.lower()
-    return any(keyword in message_lower for keyword in UNSAFE_KEYWORDS)
+    return classify_message(message).unsafe
 
 
 def is_obviously_off_topic(message: str) -> bool:
     """
     Quick check for obviously off-topic questions using keywords.
     
-    Returns True if the message is clearly off-topic.
+    Returns True if the message has off-topic keywords and no health keywords.
+    """
+    return classify_message(message, early_exit=False).off_topic
+
+
+# Bounded LRU of AI topic classifications, keyed by a digest of the normalized message
+TOPIC_CACHE_SIZE = 4096
+_topic_cache = OrderedDict()
+_topic_cache_lock = threading.Lock()
+_topic_cache_stats = {"hits": 0, "misses": 0}
+
+# Messages whose classification recently failed (key -> expiry on the monotonic
+# clock); they get the permissive answer without another API call until then
+FAILURE_TTL = 30.0
+FAILURE_CACHE_SIZE = 1024
+_failed_until = OrderedDict()
+
+# The SDK itself retries connection errors, timeouts, 429s and 5xx responses
+# (twice by default); classification sits on the request path, so allow one
+API_MAX_RETRIES = 1
+
+# Topic classification completion calls and their total wall time; one call
+# covers up to 1 + API_MAX_RETRIES HTTP requests
+_api_stats = {"completion_calls": 0, "completion_total_ms": 0.0}
+
+# validate_topic decisions made by the keyword rules vs. passed on to the AI
+_rule_stats = {"rule_hits": 0, "rule_misses": 0}
+
+# Whole-word match on the unambiguous health terms that may bypass the AI check
+_STRONG_HEALTH_RE = re.compile(
+    r"\b(?:%s)s?\b" % "|".join(map(re.escape, sorted(STRONG_HEALTH_KEYWORDS, key=len, reverse=True))),
+    re.IGNORECASE,
+)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Async validations currently waiting on the API, by cache key. Only touched from
+# the event loop thread, with no await between lookup and insert, so no lock is needed
+_inflight = {}
+
+
+def _topic_key(message: str) -> bytes:
+    """Digest the whole message, normalized (lowercase, collapsed whitespace), as a cache key."""
+    normalized = _WHITESPACE_RE.sub(" ", message.strip().lower())
+    return hashlib.blake2b(normalized.encode(), digest_size=16).digest()
+
+
+def _cache_get(key: bytes) -> Optional[bool]:
+    """Look up a cached classification, counting the hit or miss."""
+    with _topic_cache_lock:
+        if key in _topic_cache:
+            _topic_cache.move_to_end(key)
+            _topic_cache_stats["hits"] += 1
+            return _topic_cache[key]
+        _topic_cache_stats["misses"] += 1
+        return None
+
+
+def _cache_put(key: bytes, relevant: bool) -> None:
+    """Store a classification, evicting the least recently used entry when full."""
+    with _topic_cache_lock:
+        _topic_cache[key] = relevant
+        if len(_topic_cache) > TOPIC_CACHE_SIZE:
+            _topic_cache.popitem(last=False)
+
+
+def _recently_failed(key: bytes) -> bool:
+    """Check whether a message's classification failed within the last FAILURE_TTL seconds."""
+    with _topic_cache_lock:
+        expiry = _failed_until.get(key)
+        if expiry is None:
+            return False
+        if expiry > time.monotonic():
+            return True
+        del _failed_until[key]
+        return False
+
+
+def _mark_failed(key: bytes) -> None:
+    """Remember a failed classification for FAILURE_TTL seconds."""
+    with _topic_cache_lock:
+        _failed_until[key] = time.monotonic() + FAILURE_TTL
+        _failed_until.move_to_end(key)
+        if len(_failed_until) > FAILURE_CACHE_SIZE:
+            _failed_until.popitem(last=False)
+
+
+def _topic_request(message: str) -> dict:
+    """Keyword arguments for the topic classification completion."""
+    return {
+        "messages": [
+            {"role": "user", "content": TOPIC_VALIDATION_PROMPT.format(message=message)}
+        ],
+        "model": MODEL_NAME,
+        "temperature": 0.3,  # Lower temperature for more consistent classification
+        # One label token is all we read; stop before anything else is decoded
+        "max_tokens": 2,
+        "stop": ["\n", "."],
+        # Fail fast: a slow classification is worth less than the permissive default
+        "timeout": 2.0,
+    }
+
+
+def _record_api_call(start_ns: int) -> None:
+    """Add one classification completion call to the latency stats."""
+    elapsed_ms = (time.perf_counter_ns() - start_ns) / 1e6
+    with _topic_cache_lock:
+        _api_stats["completion_calls"] += 1
+        _api_stats["completion_total_ms"] += elapsed_ms
+
+
+def _complete(client, request: dict):
+    """Run a classification completion on the sync client and time it."""
+    start_ns = time.perf_counter_ns()
+    try:
+        return client.with_options(max_retries=API_MAX_RETRIES).chat.completions.create(**request)
+    finally:
+        _record_api_call(start_ns)
+
+
+async def _complete_async(client, request: dict):
+    """Run a classification completion on the async client and time it."""
+    start_ns = time.perf_counter_ns()
+    try:
+        return await client.with_options(max_retries=API_MAX_RETRIES).chat.completions.create(**request)
+    finally:
+        _record_api_call(start_ns)
+
+
+def _label_is_relevant(label: str) -> bool:
+    """
+    Parse one classification label (RELEVANT or NOT) by its first letter.
+    
+    Anything else, including an empty label, raises ValueError so that callers
+    treat it as a failed validation rather than caching a guess.
     """
-    message_lower = message.lower()
+    initial = label.strip(' "\'*')[:1].upper()
+    if initial == "R":
+        return True
+    if initial == "N":
+        return False
+    raise ValueError(f"Unexpected classification label: {label!r}")
+
+
+def _is_relevant(validation_response) -> bool:
+    """Parse the model's classification."""
+    return _label_is_relevant(validation_response.choices[0].message.content)
+
+
+class _BatchValidator:
+    """
+    Collects concurrent topic validations into one completion request.
+    
+    Messages queued within WINDOW seconds of each other (up to MAX_BATCH)
+    are sent as a single numbered prompt and the per-line labels are fanned
+    back out to each caller. A lone message uses the regular single prompt.
     
-    # Check for off-topic keywords
-    has_off_topic = any(keyword in message_lower for keyword in OFF_TOPIC_KEYWORDS)
+    Each message goes in as a JSON string literal so it can't pose as another
+    line, but one user's text can still sway the labels of the others, so
+    results from a multi-message batch are reported as not cacheable.
+    """
+    MAX_BATCH = 16
+    WINDOW = 0.015
+    MAX_QUEUE = 256
+    _LINE_RE = re.compile(r"^\s*(\d+)\s*[.):-]?\s*(\S+)", re.MULTILINE)
     
-    # Check for health-related keywords
-    has_health_keywords = any(keyword in message_lower for keyword in HEALTH_RELATED_KEYWORDS)
+    def __init__(self):
+        self._loop = None
+        self._queue = None
+        self._tasks = set()
     
-    # If it has off-topic keywords and no health keywords, it's likely off-topic
-    if has_off_topic and not has_health_keywords:
-        return True
+    async def classify(self, client, message: str) -> Tuple[bool, bool]:
+        """
+        Classify one message, batched with any concurrent ones.
+        
+        Returns:
+            Tuple of (relevant, cacheable)
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Queue and worker are bound to the running event loop
+            self._loop = loop
+            self._queue = asyncio.Queue(self.MAX_QUEUE)
+            self._spawn(self._collect(client))
+        
+        future = loop.create_future()
+        try:
+            self._queue.put_nowait((message, future))
+        except asyncio.QueueFull:
+            # Overloaded: skip batching rather than wait for queue space
+            return _is_relevant(await _complete_async(client, _topic_request(message))), True
+        return await future
+    
+    def _spawn(self, coro):
+        # Keep a reference so the task isn't garbage-collected while running
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
     
-    return False
+    async def _collect(self, client):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.WINDOW
+            while len(batch) < self.MAX_BATCH:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # Send without blocking collection of the next batch
+            self._spawn(self._dispatch(client, batch))
+    
+    async def _dispatch(self, client, batch):
+        try:
+            if len(batch) == 1:
+                results = [_is_relevant(await _complete_async(client, _topic_request(batch[0][0])))]
+            else:
+                # Quoted and escaped, so a message stays on its own line as data
+                questions = "\n".join(
+                    f"{i}. {orjson.dumps(message.strip()).decode()}" for i, (message, _) in enumerate(batch, 1)
+                )
+                response = await _complete_async(client, {
+                    "messages": [
+                        {"role": "user", "content": TOPIC_BATCH_VALIDATION_PROMPT.format(questions=questions)}
+                    ],
+                    "model": MODEL_NAME,
+                    "temperature": 0.3,
+                    # "<n>. RELEVANT" is at least four tokens per line
+                    "max_tokens": 6 * len(batch),
+                    "timeout": 2.0,
+                })
+                results = [None] * len(batch)
+                for number, label in self._LINE_RE.findall(response.choices[0].message.content):
+                    index = int(number) - 1
+                    if 0 <= index < len(batch):
+                        try:
+                            results[index] = _label_is_relevant(label)
+                        except ValueError as e:
+                            # Only this message fails; the rest of the batch stands
+                            results[index] = e
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        cacheable = len(batch) == 1
+        for (_, future), relevant in zip(batch, results):
+            if future.done():
+                continue
+            if relevant is None:
+                # The model skipped this line; the caller falls back to permissive
+                future.set_exception(ValueError("No classification returned for message"))
+            elif isinstance(relevant, Exception):
+                future.set_exception(relevant)
+            else:
+                future.set_result((relevant, cacheable))
+
+
+_batch_validator = _BatchValidator()
+
+
+def clear_topic_cache() -> None:
+    """Drop all cached topic classifications and reset the counters."""
+    with _topic_cache_lock:
+        _topic_cache.clear()
+        _failed_until.clear()
+        _topic_cache_stats["hits"] = _topic_cache_stats["misses"] = 0
+        _api_stats["completion_calls"] = 0
+        _api_stats["completion_total_ms"] = 0.0
+        _rule_stats["rule_hits"] = _rule_stats["rule_misses"] = 0
+
+
+def topic_cache_info() -> dict:
+    """
+    Get topic cache and classification API statistics.
+    
+    Returns:
+        Dictionary with hits, misses, maxsize, currsize, completion_calls,
+        completion_avg_ms and rule_hit_ratio (share of validate_topic calls
+        decided without the AI)
+    """
+    with _topic_cache_lock:
+        calls = _api_stats["completion_calls"]
+        decided = _rule_stats["rule_hits"] + _rule_stats["rule_misses"]
+        return {
+            **_topic_cache_stats,
+            "maxsize": TOPIC_CACHE_SIZE,
+            "currsize": len(_topic_cache),
+            "completion_calls": calls,
+            "completion_avg_ms": _api_stats["completion_total_ms"] / calls if calls else None,
+            "rule_hit_ratio": _rule_stats["rule_hits"] / decided if decided else None,
+        }
 
 
 def validate_topic_with_ai(message: str) -> bool:
     """
     Use AI to validate if the question is related to reproductive health.
     
+    Results are cached per normalized message (lowercased, whitespace
+    collapsed) so repeated questions skip the API call; the model is sent
+    the original text.
+    
     Returns True if the topic is relevant to reproductive health.
     """
+    client = get_client()
     if not client:
         # If Groq client is not available, be permissive
         return True
     
+    key = _topic_key(message)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+    if _recently_failed(key):
+        return True
+    
     try:
-        validation_response = client.chat.completions.create(
-            messages=[
-                {"role": "user", "content": TOPIC_VALIDATION_PROMPT.format(message=message)}
-            ],
-            model=MODEL_NAME,
-            temperature=0.3,  # Lower temperature for more consistent classification
-            max_tokens=10
-        )
-        
-        classification = validation_response.choices[0].message.content.strip().upper()
-        return "RELEVANT" in classification
-        
+        relevant = _is_relevant(_complete(client, _topic_request(message)))
     except Exception:
         # If AI validation fails, be permissive and allow the question
+        _mark_failed(key)
+        return True
+    
+    _cache_put(key, relevant)
+    return relevant
+
+
+async def validate_topic_with_ai_async(message: str) -> bool:
+    """
+    Async version of validate_topic_with_ai for use on the event loop.
+    
+    Shares the same cache, and concurrent calls for the same normalized
+    message wait on a single in-flight API request instead of each making one.
+    Concurrent calls for different messages are micro-batched into one
+    request; classifications from a multi-message batch are not cached.
+    
+    Returns True if the topic is relevant to reproductive health.
+    """
+    client = get_async_client()
+    if not client:
+        # If Groq client is not available, be permissive
+        return True
+    
+    key = _topic_key(message)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+    if _recently_failed(key):
         return True
+    
+    pending = _inflight.get(key)
+    if pending is not None:
+        # shield: a cancelled waiter must not cancel the shared request
+        return await asyncio.shield(pending)
+    
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    # If AI validation fails, be permissive and allow the question (not cached)
+    relevant = True
+    try:
+        relevant, cacheable = await _batch_validator.classify(client, message)
+        if cacheable:
+            _cache_put(key, relevant)
+    except Exception:
+        _mark_failed(key)
+    finally:
+        # Resolved even if this call is cancelled, so waiters never hang
+        del _inflight[key]
+        future.set_result(relevant)
+    return relevant
+
+
+async def validate_topic(message: str, flags: Optional[SafetyFlags] = None) -> bool:
+    """
+    Decide whether a message is on topic, using the AI only when the keywords are ambiguous.
+    
+    Messages with off-topic keywords but no health keywords are rejected
+    straight away (the same rule as is_obviously_off_topic), and messages
+    containing a whole-word STRONG_HEALTH_KEYWORDS term are accepted.
+    Everything else, including messages whose only health hits are
+    substring matches, goes to validate_topic_with_ai_async.
+    
+    Args:
+        message: User's message
+        flags: Result of classify_message(message), if the caller already has it
+        
+    Returns:
+        True if the topic is relevant to reproductive health
+    """
+    if flags is None:
+        flags = classify_message(message, early_exit=False)
+    
+    if flags.off_topic:
+        relevant = False
+    elif _STRONG_HEALTH_RE.search(message):
+        relevant = True
+    else:
+        relevant = None
+
+    with _topic_cache_lock:
+        _rule_stats["rule_misses" if relevant is None else "rule_hits"] += 1
+    if relevant is not None:
+        return relevant
+    
+    return await validate_topic_with_ai_async(message)